@@ -28,15 +28,47 @@ Requires: Python standard library only (no external dependencies)
 Environment: FASTFOLD_API_KEY
 """
 
-import argparse
+import http.client
 import json
+import re
 import sys
-import urllib.error
-import urllib.request
+import time
 
+import http_client
 from load_env import resolve_fastfold_api_key
 from security_utils import validate_base_url, validate_results_payload
 
+_ALLOWED_SEQUENCE_KEYS = ("proteinChain", "rnaSequence", "dnaSequence", "ligandSequence")
+
+# Extended IUPAC one-letter amino acid codes (incl. B/J/O/U/X/Z).
+_PROTEIN_RE = re.compile(r"\A[ACDEFGHIKLMNPQRSTVWYBJOUXZ]+\Z")
+
+
+def _validate_sequences(sequences: list) -> None:
+    """
+    Reject malformed sequence entries locally instead of paying a network
+    round-trip for the server's 400. Mirrors the SequenceInput schema in
+    references/jobs.yaml: exactly one chain type, each with a 'sequence' str.
+    """
+    for i, entry in enumerate(sequences):
+        if not isinstance(entry, dict):
+            sys.exit(f"Error: sequences[{i}] must be an object.")
+        kinds = [k for k in _ALLOWED_SEQUENCE_KEYS if k in entry]
+        if len(kinds) != 1:
+            sys.exit(
+                f"Error: sequences[{i}] must contain exactly one of "
+                f"{', '.join(_ALLOWED_SEQUENCE_KEYS)}."
+            )
+        inner = entry[kinds[0]]
+        if (
+            not isinstance(inner, dict)
+            or not isinstance(inner.get("sequence"), str)
+            or not inner["sequence"]
+        ):
+            sys.exit(f"Error: sequences[{i}].{kinds[0]} must include a non-empty 'sequence' string.")
+        if kinds[0] == "proteinChain" and not _PROTEIN_RE.match(inner["sequence"].upper()):
+            sys.exit(f"Error: sequences[{i}].proteinChain.sequence contains non-amino-acid characters.")
+
 
 def create_job_simple(
     base_url: str,
@@ -54,6 +86,7 @@ def create_job_simple(
     }
     if is_public is not None:
         body["isPublic"] = is_public
+    _validate_sequences(body["sequences"])
     return _post_job(base_url, api_key, body)
 
 
@@ -71,6 +104,7 @@ def create_job_from_payload(
             sys.exit(f"Error: Payload must include '{key}' (JobInput schema).")
     if not isinstance(payload["sequences"], list) or len(payload["sequences"]) < 1:
         sys.exit("Error: Payload 'sequences' must be a non-empty array.")
+    _validate_sequences(payload["sequences"])
     return _post_job(base_url, api_key, payload, from_id=from_id)
 
 
@@ -80,44 +114,52 @@ def _post_job(
     body: dict,
     from_id: str | None = None,
 ) -> dict:
-    url = f"{base_url.rstrip('/')}/v1/jobs"
+    # validate_base_url already stripped any trailing slash.
+    url = f"{base_url}/v1/jobs"
     if from_id:
         url = f"{url}?from={from_id}"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    req = urllib.request.Request(
-        url=url,
-        data=json.dumps(body).encode("utf-8"),
-        headers=headers,
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            response_text = resp.read().decode("utf-8", errors="replace")
-            status = resp.getcode()
-    except urllib.error.HTTPError as e:
-        status = e.code
-        response_text = e.read().decode("utf-8", errors="replace")
-    except urllib.error.URLError as e:
-        sys.exit(f"Error: Network error while creating job: {e.reason}")
+    # Compact separators: multi-sequence payloads can run to hundreds of KB,
+    # and the default ", "/": " padding is pure wire overhead.
+    data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    for attempt in range(5):
+        try:
+            # retries=0: never transparently replay a POST that may have been
+            # accepted; only an explicit 429 (job rejected) is retried below.
+            status, resp_headers, resp_body = http_client.request(
+                "POST", url, headers=headers, body=data, retries=0
+            )
+        except (http.client.HTTPException, OSError) as e:
+            sys.exit(f"Error: Network error while creating job: {e}")
+        if status == 429 and attempt < 4:
+            # Rate limited before the job was accepted; safe to retry the POST.
+            time.sleep(http_client.retry_after_seconds(resp_headers.get("Retry-After")))
+            continue
+        break
 
     if status == 401:
         sys.exit("Error: Unauthorized. Check FASTFOLD_API_KEY.")
 
     try:
-        response_json = json.loads(response_text) if response_text else {}
+        # json.loads accepts bytes directly; decode only for error messages.
+        response_json = json.loads(resp_body) if resp_body else {}
     except json.JSONDecodeError:
         sys.exit(f"Error: API returned invalid JSON (status {status}).")
 
     if status in (400, 429):
-        message = response_json.get("message", response_text)
+        message = response_json.get("message", resp_body.decode("utf-8", errors="replace"))
         sys.exit(f"Error: {status} - {message}")
     if status >= 400:
-        sys.exit(f"Error: {status} - {response_text}")
+        sys.exit(f"Error: {status} - {resp_body.decode('utf-8', errors='replace')}")
 
     return validate_results_payload(response_json)
 
 
-def main():
+def _build_parser() -> "argparse.ArgumentParser":
+    # argparse is imported here so importing this module for its helper
+    # functions skips the parser machinery entirely.
+    import argparse
+
     ap = argparse.ArgumentParser(
         description="Create a Fold job (simple mode or full JSON payload).",
         epilog="Full payload: use same JobInput as API/SDK (name, sequences, params; optional constraints, isPublic). See references/jobs.yaml.",
@@ -143,6 +185,11 @@ def main():
         help="Path to JSON file or '-' for stdin. Sends body as JobInput (sequences, params, constraints, etc.). Ignores --name/--sequence/--model.",
     )
 
+    return ap
+
+
+def main():
+    ap = _build_parser()
     args = ap.parse_args()
 
     api_key = resolve_fastfold_api_key()
@@ -13,93 +13,107 @@ Requires: Python standard library only (no external dependencies)
 Environment: FASTFOLD_API_KEY (optional for public jobs; required for private jobs)
 """
 
-import argparse
-import json
+import concurrent.futures
+import http.client
 import os
+import queue
 import sys
-import urllib.error
-import urllib.request
+import threading
 
+import http_client
 from load_env import resolve_fastfold_api_key
 from security_utils import (
+    results_view,
     validate_artifact_url,
     validate_base_url,
     validate_job_id,
-    validate_results_payload,
 )
 
 
-def get_results(base_url: str, api_key: str | None, job_id: str) -> dict:
-    url = f"{base_url.rstrip('/')}/v1/jobs/{job_id}/results"
-    headers = {"Accept": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-    req = urllib.request.Request(url=url, headers=headers, method="GET")
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            response_text = resp.read().decode("utf-8", errors="replace")
-            status = resp.getcode()
-    except urllib.error.HTTPError as e:
-        status = e.code
-        response_text = e.read().decode("utf-8", errors="replace")
-    except urllib.error.URLError as e:
-        sys.exit(f"Error: Network error while fetching results: {e.reason}")
-
-    if status == 401:
-        if api_key:
-            sys.exit("Error: Unauthorized. Check FASTFOLD_API_KEY.")
-        sys.exit("Error: Unauthorized. This job is likely private; set FASTFOLD_API_KEY.")
-    if status == 404:
-        sys.exit("Error: Job not found.")
-    if status >= 400:
-        sys.exit(f"Error: {status} - {response_text}")
-    try:
-        return validate_results_payload(json.loads(response_text))
-    except json.JSONDecodeError:
-        sys.exit(f"Error: API returned invalid JSON (status {status}).")
-
-
 def download(url: str, path: str, max_bytes: int) -> None:
     safe_url = validate_artifact_url(url)
-    req = urllib.request.Request(url=safe_url, method="GET")
-    no_redirect = urllib.request.build_opener(_NoRedirectHandler())
     try:
-        with no_redirect.open(req, timeout=60) as resp:
-            content_type = (resp.headers.get("Content-Type") or "").lower()
-            if content_type and ("html" in content_type or "javascript" in content_type):
-                sys.exit(f"Error: Unexpected artifact content-type: {content_type}")
-            content_len = resp.headers.get("Content-Length")
-            if content_len:
-                try:
-                    if int(content_len) > max_bytes:
-                        sys.exit(f"Error: Artifact exceeds size limit ({max_bytes} bytes).")
-                except ValueError:
-                    pass
-
+        # http_client.stream never follows redirects, so 3xx surfaces below.
+        resp = http_client.stream("GET", safe_url, timeout=60)
+    except (http.client.HTTPException, OSError) as e:
+        sys.exit(f"Error: Network error while downloading artifact: {e}")
+    try:
+        if 300 <= resp.status < 400:
+            sys.exit("Error: Redirects are not allowed for artifact downloads.")
+        if resp.status >= 400:
+            sys.exit(f"Error: Failed to download artifact (HTTP {resp.status}).")
+        content_type = (resp.headers.get("Content-Type") or "").lower()
+        if content_type and ("html" in content_type or "javascript" in content_type):
+            sys.exit(f"Error: Unexpected artifact content-type: {content_type}")
+        content_len = resp.headers.get("Content-Length")
+        if content_len:
+            try:
+                if int(content_len) > max_bytes:
+                    sys.exit(f"Error: Artifact exceeds size limit ({max_bytes} bytes).")
+            except ValueError:
+                pass
+
+        # Pipelined copy: the socket side readinto()s 64 KiB buffers from a
+        # small recycled pool while a writer thread drains them to disk, so
+        # network reads overlap disk writes instead of alternating. CIF
+        # artifacts are frequently multi-MB, and readinto keeps the loop free
+        # of per-chunk allocations; buffering=0 because writes are already
+        # 64 KiB units.
+        free: queue.Queue = queue.Queue()
+        for _ in range(4):
+            free.put(bytearray(65536))
+        chunks: queue.Queue = queue.Queue()
+        error: list[str] = []
+
+        def _writer(f) -> None:
+            # Always consume until the sentinel (recycling buffers) so the
+            # reader can never deadlock on the pool, even after an error.
             bytes_written = 0
-            with open(path, "wb") as f:
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    bytes_written += len(chunk)
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                buf, n = item
+                bytes_written += n
+                if not error:
                     if bytes_written > max_bytes:
-                        sys.exit(f"Error: Artifact exceeds size limit ({max_bytes} bytes).")
-                    f.write(chunk)
-    except urllib.error.HTTPError as e:
-        if 300 <= e.code < 400:
-            sys.exit("Error: Redirects are not allowed for artifact downloads.")
-        sys.exit(f"Error: Failed to download artifact (HTTP {e.code}).")
-    except urllib.error.URLError as e:
-        sys.exit(f"Error: Network error while downloading artifact: {e.reason}")
-
-
-class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
-    def redirect_request(self, req, fp, code, msg, headers, newurl):
-        return None
-
+                        error.append(f"Error: Artifact exceeds size limit ({max_bytes} bytes).")
+                    else:
+                        try:
+                            f.write(memoryview(buf)[:n])
+                        except OSError as e:
+                            # Record and keep draining: if the thread died here
+                            # the reader would block forever on the buffer pool,
+                            # and a failure near EOF would pass as success.
+                            error.append(f"Error: Failed to write artifact to disk: {e}")
+                free.put(buf)
+
+        with open(path, "wb", buffering=0) as f:
+            writer = threading.Thread(target=_writer, args=(f,))
+            writer.start()
+            try:
+                while not error:
+                    buf = free.get()
+                    n = resp.readinto(buf)
+                    if not n:
+                        break
+                    chunks.put((buf, n))
+            finally:
+                chunks.put(None)
+                writer.join()
+        if error:
+            sys.exit(error[0])
+    except (http.client.HTTPException, OSError) as e:
+        sys.exit(f"Error: Network error while downloading artifact: {e}")
+    finally:
+        http_client.release(safe_url, resp)
+
+
+def _build_parser() -> "argparse.ArgumentParser":
+    # argparse is imported here so importing this module for its helper
+    # functions skips the parser machinery entirely.
+    import argparse
 
-def main():
     ap = argparse.ArgumentParser(description="Download CIF file(s) for a completed FastFold job.")
     ap.add_argument("job_id", help="FastFold job ID (UUID)")
     ap.add_argument("--out", help="Output CIF path (single file; use for complex or single-sequence)")
@@ -111,6 +125,17 @@ def main():
         default=50_000_000,
         help="Maximum artifact size in bytes (default 50000000)",
     )
+    ap.add_argument(
+        "--parallel",
+        type=int,
+        default=4,
+        help="Max concurrent downloads for multi-sequence jobs (default 4)",
+    )
+    return ap
+
+
+def main():
+    ap = _build_parser()
     args = ap.parse_args()
 
     api_key = resolve_fastfold_api_key()
@@ -119,34 +144,25 @@ def main():
     base_url = validate_base_url(args.base_url)
     if args.max_bytes <= 0:
         sys.exit("Error: --max-bytes must be > 0.")
+    if args.parallel <= 0:
+        sys.exit("Error: --parallel must be > 0.")
 
-    data = get_results(base_url, api_key, job_id)
-    job = data.get("job", {})
-    status = job.get("status")
-    if status != "COMPLETED":
-        sys.exit(f"Error: Job status is {status}, not COMPLETED. Wait for completion first.")
+    view = results_view(http_client.get_results(base_url, api_key, job_id))
+    if view.status != "COMPLETED":
+        sys.exit(f"Error: Job status is {view.status}, not COMPLETED. Wait for completion first.")
 
-    is_complex = job.get("isComplex", False)
-    sequences = data.get("sequences", [])
-    pred = data.get("predictionPayload")
-
-    if is_complex and pred and pred.get("cif_url"):
-        url = pred["cif_url"]
+    if view.is_complex and view.complex_cif_url:
         if args.out:
             path = args.out
         else:
             path = os.path.join(args.dir, f"{job_id}.cif")
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        download(url, path, max_bytes=args.max_bytes)
+        download(view.complex_cif_url, path, max_bytes=args.max_bytes)
         print(path)
         return
 
     # Non-complex: one CIF per sequence
-    urls = []
-    for s in sequences:
-        pp = (s or {}).get("predictionPayload") or {}
-        if pp.get("cif_url"):
-            urls.append(pp["cif_url"])
+    urls = view.sequence_cif_urls
     if not urls:
         sys.exit("Error: No CIF URLs in results.")
     if args.out and len(urls) == 1:
@@ -157,9 +173,21 @@ def main():
     if args.out and len(urls) > 1:
         sys.exit("Error: Job has multiple sequences; use --dir instead of --out.")
     os.makedirs(args.dir, exist_ok=True)
-    for i, url in enumerate(urls):
-        path = os.path.join(args.dir, f"output_{i}.cif")
-        download(url, path, max_bytes=args.max_bytes)
+    paths = [os.path.join(args.dir, f"output_{i}.cif") for i in range(len(urls))]
+    workers = min(args.parallel, len(urls))
+    if workers == 1:
+        for url, path in zip(urls, paths):
+            download(url, path, max_bytes=args.max_bytes)
+            print(path)
+        return
+    # Downloads are network-bound against the same host; fetch them concurrently.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(download, url, path, args.max_bytes) for url, path in zip(urls, paths)
+        ]
+        for future in futures:
+            future.result()
+    for path in paths:
         print(path)
 
 
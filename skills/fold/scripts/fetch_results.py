@@ -10,44 +10,11 @@ Requires: Python standard library only (no external dependencies)
 Environment: FASTFOLD_API_KEY (optional for public jobs; required for private jobs)
 """
 
-import argparse
 import json
-import sys
-import urllib.error
-import urllib.request
 
+import http_client
 from load_env import resolve_fastfold_api_key
-from security_utils import validate_base_url, validate_job_id, validate_results_payload
-
-
-def get_results(base_url: str, api_key: str | None, job_id: str) -> dict:
-    url = f"{base_url.rstrip('/')}/v1/jobs/{job_id}/results"
-    headers = {"Accept": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-    req = urllib.request.Request(url=url, headers=headers, method="GET")
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            response_text = resp.read().decode("utf-8", errors="replace")
-            status = resp.getcode()
-    except urllib.error.HTTPError as e:
-        status = e.code
-        response_text = e.read().decode("utf-8", errors="replace")
-    except urllib.error.URLError as e:
-        sys.exit(f"Error: Network error while fetching results: {e.reason}")
-
-    if status == 401:
-        if api_key:
-            sys.exit("Error: Unauthorized. Check FASTFOLD_API_KEY.")
-        sys.exit("Error: Unauthorized. This job is likely private; set FASTFOLD_API_KEY.")
-    if status == 404:
-        sys.exit("Error: Job not found.")
-    if status >= 400:
-        sys.exit(f"Error: {status} - {response_text}")
-    try:
-        return validate_results_payload(json.loads(response_text))
-    except json.JSONDecodeError:
-        sys.exit(f"Error: API returned invalid JSON (status {status}).")
+from security_utils import validate_base_url, validate_job_id
 
 
 def summary(data: dict) -> str:
@@ -113,18 +80,27 @@ def summary(data: dict) -> str:
     return "\n".join(lines)
 
 
-def main():
+def _build_parser() -> "argparse.ArgumentParser":
+    # argparse is imported here so importing this module for its helper
+    # functions skips the parser machinery entirely.
+    import argparse
+
     ap = argparse.ArgumentParser(description="Fetch FastFold job results.")
     ap.add_argument("job_id", help="FastFold job ID (UUID)")
     ap.add_argument("--base-url", default="https://api.fastfold.ai", help="API base URL")
     ap.add_argument("--json", action="store_true", help="Print full API JSON (untrusted content)")
+    return ap
+
+
+def main():
+    ap = _build_parser()
     args = ap.parse_args()
 
     api_key = resolve_fastfold_api_key()
 
     job_id = validate_job_id(args.job_id)
     base_url = validate_base_url(args.base_url)
-    data = get_results(base_url, api_key, job_id)
+    data = http_client.get_results(base_url, api_key, job_id)
     if args.json:
         print(json.dumps(data, indent=2))
     else:
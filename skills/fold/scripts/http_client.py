@@ -0,0 +1,260 @@
+"""
+Shared keep-alive HTTP client for FastFold scripts.
+
+urllib.request opens a fresh TCP+TLS connection for every call, so a workflow
+that creates a job, polls for completion, and downloads artifacts pays a full
+handshake each time. This module keeps one http.client connection per
+(scheme, host) — per thread, since http.client connections are not
+thread-safe — and reuses it across calls in the same process.
+
+Requires: Python standard library only (no external dependencies)
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
+from email.message import Message
+from email.utils import parsedate_to_datetime
+
+from security_utils import validate_results_payload
+
+# Transient gateway errors worth a blind retry with backoff.
+_RETRYABLE_STATUSES = (502, 503, 504)
+
+# Methods safe to replay when a request fails mid-flight: the server may have
+# processed it before the error, so only idempotent methods qualify.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+_local = threading.local()
+
+# One TLS context for the whole process: the CA store is loaded once instead
+# of per connection, and the context's session cache lets additional
+# connections to the same host (polling + parallel downloads) resume the TLS
+# session with an abbreviated handshake.
+_ssl_lock = threading.Lock()
+_ssl_context: ssl.SSLContext | None = None
+
+
+def _shared_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        with _ssl_lock:
+            if _ssl_context is None:
+                _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _connections() -> dict[tuple[str, str], http.client.HTTPConnection]:
+    try:
+        return _local.connections
+    except AttributeError:
+        _local.connections = {}
+        return _local.connections
+
+
+def _connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    conns = _connections()
+    conn = conns.get((scheme, netloc))
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                netloc, timeout=timeout, context=_shared_ssl_context()
+            )
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=timeout)
+        conns[(scheme, netloc)] = conn
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(scheme: str, netloc: str) -> None:
+    conn = _connections().pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def _split(url: str) -> tuple[str, str, str]:
+    parsed = urllib.parse.urlsplit(url)
+    target = parsed.path or "/"
+    if parsed.query:
+        target = f"{target}?{parsed.query}"
+    return parsed.scheme, parsed.netloc, target
+
+
+def request(
+    method: str,
+    url: str,
+    headers: dict[str, str] | None = None,
+    body: bytes | None = None,
+    timeout: float = 30.0,
+    retries: int = 3,
+) -> tuple[int, Message, bytes]:
+    """
+    Issue a request over a cached keep-alive connection; returns (status, headers, body).
+
+    Reconnects when a reused socket has gone stale and retries transient
+    network errors and 502/503/504 responses with a short backoff, up to
+    `retries` times. Pass retries=0 for non-idempotent requests. Raises
+    OSError / http.client.HTTPException when the request cannot complete.
+    """
+    scheme, netloc, target = _split(url)
+    attempt = 0
+    while True:
+        conn = _connection(scheme, netloc, timeout)
+        reused = conn.sock is not None
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.will_close:
+                _drop_connection(scheme, netloc)
+        except (http.client.HTTPException, OSError):
+            _drop_connection(scheme, netloc)
+            if reused:
+                if method in _IDEMPOTENT_METHODS:
+                    # Server likely closed an idle keep-alive socket; retrying
+                    # on a fresh connection does not count against the budget.
+                    continue
+                # A POST on a warm socket may already have been delivered
+                # (e.g. the response timed out); never transparently replay it.
+                raise
+            if attempt >= retries:
+                raise
+            time.sleep(0.5 * (2**attempt))
+            attempt += 1
+            continue
+        if resp.status in _RETRYABLE_STATUSES and attempt < retries:
+            time.sleep(0.5 * (2**attempt))
+            attempt += 1
+            continue
+        return resp.status, resp.headers, data
+
+
+def stream(
+    method: str,
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float = 30.0,
+) -> http.client.HTTPResponse:
+    """
+    Issue a request and return the raw HTTPResponse for streaming reads.
+
+    http.client never follows redirects, so 3xx responses surface as-is.
+    The caller should read to EOF and then call release(url, resp) so the
+    connection can be reused (or discarded when no longer usable).
+    """
+    scheme, netloc, target = _split(url)
+    while True:
+        conn = _connection(scheme, netloc, timeout)
+        reused = conn.sock is not None
+        try:
+            conn.request(method, target, headers=headers or {})
+            return conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            _drop_connection(scheme, netloc)
+            if not reused:
+                raise
+            # Stale keep-alive socket; retry once on a fresh connection.
+
+
+def release(url: str, resp: http.client.HTTPResponse) -> None:
+    """Return a streamed response's connection to the cache, or drop it if unusable."""
+    scheme, netloc, _ = _split(url)
+    if resp.will_close or not resp.isclosed():
+        resp.close()
+        _drop_connection(scheme, netloc)
+
+
+# Longest we will honor from a Retry-After header: a buggy or hostile value
+# ("inf", 1e300, a far-future date) must not block the caller indefinitely.
+_RETRY_AFTER_MAX = 60.0
+
+
+def retry_after_seconds(value: str | None) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP-date); default 5s, capped at 60s."""
+    if value:
+        try:
+            return min(_RETRY_AFTER_MAX, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            return min(
+                _RETRY_AFTER_MAX, max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            )
+        except (TypeError, ValueError):
+            pass
+    return 5.0
+
+
+def get_results(
+    base_url: str,
+    api_key: str | None,
+    job_id: str,
+    cache: dict | None = None,
+) -> dict:
+    """
+    Fetch GET /v1/jobs/{jobId}/results and return the validated payload.
+
+    Honors 429 Retry-After (up to 5 attempts) and exits with a user-facing
+    message on auth/network errors. Pass a `cache` dict when polling: the ETag /
+    Last-Modified from the previous response is replayed as a conditional GET
+    and a 304 returns the previously parsed payload.
+    """
+    # validate_base_url already stripped any trailing slash; when polling, the
+    # built URL is kept in the cache so each iteration reuses the same str.
+    url = cache.get("url") if cache else None
+    if url is None:
+        url = f"{base_url}/v1/jobs/{job_id}/results"
+        if cache is not None:
+            cache["url"] = url
+    headers = {"Accept": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    if cache and cache.get("data") is not None:
+        # Results only change on status transitions; a conditional GET lets the
+        # server answer 304 with no body for the common unchanged poll.
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        elif cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    for attempt in range(5):
+        try:
+            status, resp_headers, body = request("GET", url, headers=headers)
+        except (http.client.HTTPException, OSError) as e:
+            sys.exit(f"Error: Network error while fetching results: {e}")
+        if status == 429 and attempt < 4:
+            # Rate limited: honor Retry-After instead of failing outright.
+            time.sleep(retry_after_seconds(resp_headers.get("Retry-After")))
+            continue
+        break
+    if status == 304 and cache and cache.get("data") is not None:
+        return cache["data"]
+
+    if status == 401:
+        if api_key:
+            sys.exit("Error: Unauthorized. Check FASTFOLD_API_KEY.")
+        sys.exit("Error: Unauthorized. This job is likely private; set FASTFOLD_API_KEY.")
+    if status == 404:
+        sys.exit("Error: Job not found.")
+    if status >= 400:
+        sys.exit(f"Error: {status} - {body.decode('utf-8', errors='replace')}")
+    try:
+        # json.loads accepts bytes and fuses the UTF-8 decode with the parse,
+        # skipping the intermediate full-payload str.
+        data = validate_results_payload(json.loads(body))
+    except json.JSONDecodeError:
+        sys.exit(f"Error: API returned invalid JSON (status {status}).")
+    if cache is not None:
+        cache["etag"] = resp_headers.get("ETag")
+        cache["last_modified"] = resp_headers.get("Last-Modified")
+        cache["data"] = data
+    return data
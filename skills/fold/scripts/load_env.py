@@ -6,23 +6,37 @@ for .env; only sets variables that are not already in os.environ.
 Usage: Call load_dotenv() at the start of main() before reading os.environ.
 """
 
-import json
 import os
-from pathlib import Path
+import re
+
+# KEY=value with optional leading `export`; invalid keys and comments don't match.
+_ENV_LINE_RE = re.compile(r"\A\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*\Z")
+
+# Resolved .env path, memoized so repeated loads in one process skip the walk.
+_dotenv_path: str | None = None
 
 
 def load_dotenv() -> None:
     """Load .env from current directory or any parent directory. Does not override existing env vars."""
-    search_dirs = []
-    d = os.getcwd()
-    while d and d != os.path.dirname(d):
-        search_dirs.append(d)
-        d = os.path.dirname(d)
-    for dirpath in search_dirs:
-        env_path = os.path.join(dirpath, ".env")
-        if os.path.isfile(env_path):
-            _parse_and_set(env_path)
-            return
+    global _dotenv_path
+    if _dotenv_path is None:
+        # FASTFOLD_DOTENV_PATH short-circuits the parent-directory walk (one
+        # stat per level); set it after the first find so child processes of a
+        # batch run inherit the resolved path.
+        cached = os.environ.get("FASTFOLD_DOTENV_PATH")
+        if cached and os.path.isfile(cached):
+            _dotenv_path = cached
+    if _dotenv_path is None:
+        d = os.getcwd()
+        while d and d != os.path.dirname(d):
+            env_path = os.path.join(d, ".env")
+            if os.path.isfile(env_path):
+                _dotenv_path = env_path
+                os.environ.setdefault("FASTFOLD_DOTENV_PATH", env_path)
+                break
+            d = os.path.dirname(d)
+    if _dotenv_path is not None:
+        _parse_and_set(_dotenv_path)
 
 
 def resolve_fastfold_api_key() -> str | None:
@@ -47,7 +61,11 @@ def resolve_fastfold_api_key() -> str | None:
     if api_key:
         return api_key
 
-    # 3) Fallback to FastFold CLI config file.
+    # 3) Fallback to FastFold CLI config file. Imported lazily: most runs
+    # resolve the key from the environment or .env and never parse JSON.
+    import json
+    from pathlib import Path
+
     config_path = Path.home() / ".fastfold-cli" / "config.json"
     if not config_path.exists():
         return None
@@ -67,18 +85,10 @@ def resolve_fastfold_api_key() -> str | None:
 def _parse_and_set(env_path: str) -> None:
     with open(env_path, "r", encoding="utf-8") as f:
         for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, _, value = line.partition("=")
-            key = key.strip()
-            value = value.strip()
-            if key.startswith("export "):
-                key = key[7:].strip()
-            if not key:
+            m = _ENV_LINE_RE.match(line)
+            if not m:
                 continue
+            key, value = m.group(1), m.group(2)
             # Remove surrounding quotes
             if len(value) >= 2 and (
                 (value.startswith('"') and value.endswith('"'))
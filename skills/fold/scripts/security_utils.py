@@ -7,21 +7,32 @@ side-effecting operations such as network requests and file writes.
 
 from __future__ import annotations
 
+import re
 import sys
-import uuid
+from dataclasses import dataclass
 from urllib.parse import urlparse
 
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+# Already-normalized base URLs that can skip the urlparse round-trip.
+_KNOWN_BASE_URLS = frozenset({"https://api.fastfold.ai"})
+
+_ARTIFACT_FAST_PREFIX = "https://artifacts.fastfold.ai/"
+
 
 def validate_job_id(job_id: str) -> str:
-    """Require RFC4122 UUID format for job IDs."""
-    try:
-        return str(uuid.UUID(job_id))
-    except (ValueError, TypeError):
-        sys.exit("Error: job_id must be a valid UUID.")
+    """Require canonical 8-4-4-4-12 UUID format for job IDs."""
+    if isinstance(job_id, str) and _UUID_RE.match(job_id):
+        return job_id.lower()
+    sys.exit("Error: job_id must be a valid UUID.")
 
 
 def validate_base_url(base_url: str) -> str:
     """Basic safety checks for API base URL."""
+    if base_url in _KNOWN_BASE_URLS:
+        return base_url
     parsed = urlparse(base_url)
     if parsed.scheme not in ("https", "http"):
         sys.exit("Error: base URL must use http or https.")
@@ -41,6 +52,42 @@ def validate_results_payload(data: object) -> dict:
     return data
 
 
+@dataclass(frozen=True, slots=True)
+class ResultsView:
+    """Fields the scripts branch on, extracted once from a results payload."""
+
+    status: str
+    is_complex: bool
+    complex_cif_url: str | None
+    sequence_cif_urls: tuple[str, ...]
+
+
+def results_view(data: dict) -> ResultsView:
+    """
+    Extract the hot fields of a validated results payload into a typed view,
+    so callers use attribute access instead of repeated chained dict lookups
+    (each with its own defensive default).
+    """
+    job = data.get("job")
+    if not isinstance(job, dict):
+        job = {}
+    pred = data.get("predictionPayload")
+    complex_cif_url = pred.get("cif_url") if isinstance(pred, dict) else None
+    sequence_cif_urls = []
+    sequences = data.get("sequences")
+    if isinstance(sequences, list):
+        for seq in sequences:
+            pp = seq.get("predictionPayload") if isinstance(seq, dict) else None
+            if isinstance(pp, dict) and pp.get("cif_url"):
+                sequence_cif_urls.append(pp["cif_url"])
+    return ResultsView(
+        status=job.get("status", "UNKNOWN"),
+        is_complex=bool(job.get("isComplex", False)),
+        complex_cif_url=complex_cif_url or None,
+        sequence_cif_urls=tuple(sequence_cif_urls),
+    )
+
+
 def validate_artifact_url(url: str) -> str:
     """
     Validate artifact URL before download.
@@ -48,6 +95,17 @@ def validate_artifact_url(url: str) -> str:
     """
     if not isinstance(url, str) or not url:
         sys.exit("Error: Missing artifact URL.")
+    # Fast path for the canonical artifact host. Deliberately narrower than the
+    # urlparse path below (which only needs ".cif" somewhere in the path):
+    # anything that misses here falls through and gets the full check, so the
+    # set of accepted URLs is unchanged.
+    if (
+        url.startswith(_ARTIFACT_FAST_PREFIX)
+        and url.lower().endswith(".cif")
+        and "?" not in url
+        and "#" not in url
+    ):
+        return url
     parsed = urlparse(url)
     if parsed.scheme != "https":
         sys.exit("Error: Artifact URL must use https.")
@@ -10,55 +10,34 @@ Requires: Python standard library only (no external dependencies)
 Environment: FASTFOLD_API_KEY (optional for public jobs; required for private jobs)
 """
 
-import argparse
 import json
+import random
 import sys
 import time
-import urllib.error
-import urllib.request
 
+import http_client
 from load_env import resolve_fastfold_api_key
-from security_utils import validate_base_url, validate_job_id, validate_results_payload
+from security_utils import results_view, validate_base_url, validate_job_id
 
 
-def get_results(base_url: str, api_key: str | None, job_id: str) -> dict:
-    url = f"{base_url.rstrip('/')}/v1/jobs/{job_id}/results"
-    headers = {"Accept": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-    req = urllib.request.Request(url=url, headers=headers, method="GET")
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            response_text = resp.read().decode("utf-8", errors="replace")
-            status = resp.getcode()
-    except urllib.error.HTTPError as e:
-        status = e.code
-        response_text = e.read().decode("utf-8", errors="replace")
-    except urllib.error.URLError as e:
-        sys.exit(f"Error: Network error while fetching results: {e.reason}")
+def _build_parser() -> "argparse.ArgumentParser":
+    # argparse is imported here so importing this module for its helper
+    # functions skips the parser machinery entirely.
+    import argparse
 
-    if status == 401:
-        if api_key:
-            sys.exit("Error: Unauthorized. Check FASTFOLD_API_KEY.")
-        sys.exit("Error: Unauthorized. This job is likely private; set FASTFOLD_API_KEY.")
-    if status == 404:
-        sys.exit("Error: Job not found.")
-    if status >= 400:
-        sys.exit(f"Error: {status} - {response_text}")
-    try:
-        return validate_results_payload(json.loads(response_text))
-    except json.JSONDecodeError:
-        sys.exit(f"Error: API returned invalid JSON (status {status}).")
-
-
-def main():
     ap = argparse.ArgumentParser(description="Wait for FastFold job completion.")
     ap.add_argument("job_id", help="FastFold job ID (UUID)")
-    ap.add_argument("--poll-interval", type=float, default=5.0, help="Seconds between polls (default 5)")
+    ap.add_argument("--poll-interval", type=float, default=5.0, help="Initial seconds between polls (default 5)")
+    ap.add_argument("--max-interval", type=float, default=30.0, help="Max seconds between polls (default 30)")
     ap.add_argument("--timeout", type=float, default=900.0, help="Max seconds to wait (default 900)")
     ap.add_argument("--base-url", default="https://api.fastfold.ai", help="API base URL")
     ap.add_argument("--json", action="store_true", help="Print final results JSON to stdout")
     ap.add_argument("--quiet", action="store_true", help="Do not print status lines")
+    return ap
+
+
+def main():
+    ap = _build_parser()
     args = ap.parse_args()
 
     api_key = resolve_fastfold_api_key()
@@ -68,10 +47,11 @@ def main():
 
     start = time.time()
     last_status = None
+    attempt = 0
+    cache: dict = {}
     while True:
-        data = get_results(base_url, api_key, job_id)
-        job = data.get("job", {})
-        status = job.get("status", "UNKNOWN")
+        data = http_client.get_results(base_url, api_key, job_id, cache=cache)
+        status = results_view(data).status
         if not args.quiet:
             print(f"[FastFold] job {job_id} status: {status}", file=sys.stderr)
         if status == "COMPLETED":
@@ -84,7 +64,12 @@ def main():
             sys.exit(1)
         if (time.time() - start) > args.timeout:
             sys.exit(2)  # timeout
-        time.sleep(max(0.1, args.poll_interval))
+        # Poll fast early (jobs may finish quickly), then back off geometrically
+        # toward --max-interval. Jitter de-synchronizes concurrent waiters.
+        interval = min(args.max_interval, args.poll_interval * (1.5 ** attempt))
+        interval *= random.uniform(0.8, 1.2)
+        time.sleep(max(0.1, interval))
+        attempt += 1
 
 
 if __name__ == "__main__":